@@ -6,30 +6,70 @@
 # or selecting options from a list displayed in the terminal/console.
 
 import os
-import threading
-import time
+import sys
+import atexit
+import bisect
+import csv
 import datetime
+import io
+import mmap
+import functools
+import operator
+import re
+from concurrent.futures import ThreadPoolExecutor
 
 # Decorator Function log_function_call
 # This function is a decorator used to log function calls. It prints the function name, arguments, and keyword arguments when the decorated function is called.
 # log_function_call: The outer function, which takes a boolean argument suppress_message to determine whether to suppress the log message.
 # decorator: Inner function acting as the actual decorator.
 # wrapper: Innermost function wrapping the original function, which prints the log message before calling the original function.
+# When suppress_message is True the original function is returned unwrapped, so suppressed calls cost nothing extra.
 
 def log_function_call(suppress_message=False):
+    if suppress_message:
+        return lambda func: func
     def decorator(func):
         def wrapper(*args, **kwargs):
-            if not suppress_message:
-                print(f"Calling {func.__name__} with args: {args}, kwargs: {kwargs}")
+            print(f"Calling {func.__name__} with args: {args}, kwargs: {kwargs}")
             return func(*args, **kwargs)
         return wrapper
     return decorator
 
 
+# Due Date Parsing
+# _parse_due_date converts a YYYY-MM-DD string into a date. Results are memoized because the same due dates
+# are parsed repeatedly while validating input.
+
+@functools.lru_cache(maxsize=1024)
+def _parse_due_date(date_string):
+    return datetime.date.fromisoformat(date_string)
+
+# _normalize_due_date rewrites a due date read from the tasks file into strict YYYY-MM-DD form. Older files can
+# hold unpadded dates such as 2026-9-5, which strptime accepted; those would otherwise sort out of order as strings.
+
+def _normalize_due_date(date_string):
+    try:
+        return _parse_due_date(date_string).isoformat()
+    except ValueError:
+        return datetime.datetime.strptime(date_string, '%Y-%m-%d').date().isoformat()
+
+
+# _csv_line formats a row exactly as save_tasks writes it, without the line terminator.
+
+def _csv_line(row):
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator='').writerow(row)
+    return buf.getvalue()
+
+
 # Task Class
 # Defines a Task class with attributes task_id, description, priority, and due_date. This class is a simple data structure representing a task.
+# task_id and priority are ints; description and due_date (YYYY-MM-DD) are strings.
+# __slots__ gives each instance a fixed attribute layout instead of a per-instance __dict__.
 
 class Task:
+    __slots__ = ("task_id", "description", "priority", "due_date")
+
     def __init__(self, task_id, description, priority, due_date):
         self.task_id = task_id
         self.description = description
@@ -40,115 +80,117 @@ class Task:
 # TaskManager Class
 # Defines a TaskManager class responsible for managing tasks. It includes methods for adding, deleting, displaying, and sorting tasks,
 # as well as saving and loading tasks from a file.
+# Besides the task list, it keeps an index by task ID and two lists kept sorted on every add and delete
+# (by priority and by due date), so sorting only has to copy an already ordered list.
 
 class TaskManager:
+    _priority_key = operator.attrgetter('priority')
+    # Due dates are stored as strict YYYY-MM-DD strings (enforced by validate_due_date for typed input and by
+    # _normalize_due_date for loaded tasks), which sort chronologically as plain strings.
+    _due_date_key = operator.attrgetter('due_date')
+
     def __init__(self): 
         self.tasks = []
         self.task_id_counter = 1  # Initialize the task ID counter
         self.sorted_tasks = []  # Temporary sorted list of tasks
+        self._by_id = {}  # Index of tasks by task ID for constant-time lookup
+        self._by_priority = []  # Tasks in ascending priority order
+        self._by_due_date = []  # Tasks in ascending due date order
+
+    # Adds a task to the task list and to every index
+    def _index_task(self, task):
+        self.tasks.append(task)
+        self._by_id[task.task_id] = task
+        # Equal priorities are inserted before existing ones so the reversed list keeps insertion order
+        bisect.insort_left(self._by_priority, task, key=self._priority_key)
+        bisect.insort_right(self._by_due_date, task, key=self._due_date_key)
+
+    # Removes a task from a list kept sorted by key, locating it by binary search
+    @staticmethod
+    def _unindex_sorted(sorted_tasks, task, key):
+        i = bisect.bisect_left(sorted_tasks, key(task), key=key)
+        while sorted_tasks[i] is not task:
+            i += 1
+        del sorted_tasks[i]
 
 
     @log_function_call(suppress_message=True)  # Suppress the message for add_task
     def add_task(self, description, priority, due_date): 
         task = Task(self.task_id_counter, description, priority, due_date)
-        self.tasks.append(task)
+        self._index_task(task)
         self.task_id_counter += 1  # Increment the task ID counter
 
+    # Adds a task read from the tasks file, keeping its saved ID and moving the ID counter past it.
+    # If the ID is already taken (a duplicate in the file, or a task added before loading finished),
+    # the loaded task gets the next free ID instead, so no saved task is dropped.
+    def _add_task_loaded(self, task_id, description, priority, due_date):
+        if task_id in self._by_id:
+            task_id = self.task_id_counter
+        self._index_task(Task(task_id, description, priority, due_date))
+        self.task_id_counter = max(self.task_id_counter, task_id + 1)
+
     def delete_task(self, task_id):
-        for task in self.tasks:
-            if task.task_id == task_id:
-                self.tasks.remove(task)
-                return True
-        return False
+        task = self._by_id.pop(task_id, None)
+        if task is None:
+            return False
+        self.tasks.remove(task)
+        self._unindex_sorted(self._by_priority, task, self._priority_key)
+        self._unindex_sorted(self._by_due_date, task, self._due_date_key)
+        return True
 
     def generate_tasks(self): # ITERATOR, # GENERATOR
         for task in self.tasks:
             yield task
 
-    def display_tasks(self):
-        if not self.tasks:
+    # Computes the column widths for a non-empty table of tasks, starting from the minimum widths of the
+    # ID, Description, Priority and Due Date columns. The rows are transposed into one tuple per column
+    # so each width is found by max(map(len, ...)) without a Python-level loop over the tasks.
+    @staticmethod
+    def _column_widths(tasks):
+        columns = zip(*[(str(task.task_id), task.description, str(task.priority), task.due_date)
+                        for task in tasks])
+        return tuple(max(minimum, max(map(len, column)))
+                     for minimum, column in zip((5, 20, 10, 12), columns))
+
+    # Renders a table of tasks under the given header. Shared by display_tasks and display_sorted_tasks.
+    def _render(self, tasks, header):
+        if not tasks:
             print("No tasks to display.")
             return
 
         # Determine the maximum width for each column
-        max_widths = {
-            "ID": 5,
-            "Description": 20,
-            "Priority": 10,
-            "Due Date": 12
-        }
+        id_w, desc_w, pri_w, date_w = self._column_widths(tasks)
+
+        # Bake the padded widths (2 extra characters per column) into the format string once
+        format_str = f"{{:<{id_w + 2}}} | {{:<{desc_w + 2}}} | {{:<{pri_w + 2}}} | {{:<{date_w + 2}}}"
+        lines = [header,
+                 format_str.format("ID", "Description", "Priority", "Due Date"),
+                 "-" * (id_w + desc_w + pri_w + date_w)]
+        lines.extend(format_str.format(task.task_id, task.description, task.priority, task.due_date)
+                     for task in tasks)
+        # Emit the whole table with a single write
+        sys.stdout.write("\n".join(lines) + "\n")
 
-        for task in self.tasks:
-            # Update max_widths based on task details
-            max_widths["ID"] = max(max_widths["ID"], len(str(task.task_id)))
-            max_widths["Description"] = max(max_widths["Description"], len(task.description))
-            max_widths["Priority"] = max(max_widths["Priority"], len(str(task.priority)))
-            max_widths["Due Date"] = max(max_widths["Due Date"], len(task.due_date))
-
-        # Display the tasks with adjusted column widths
-        print("Tasks:")
-        format_str = "{:<{id_width}} | {:<{desc_width}} | {:<{priority_width}} | {:<{due_date_width}}"
-        print(format_str.format("ID", "Description", "Priority", "Due Date", 
-                                id_width=max_widths["ID"] + 2,  # Adding 2 for padding
-                                desc_width=max_widths["Description"] + 2,  # Adding 2 for padding
-                                priority_width=max_widths["Priority"] + 2,  # Adding 2 for padding
-                                due_date_width=max_widths["Due Date"] + 2))  # Adding 2 for padding
-        print("-" * sum(max_widths.values()))
-
-        for task in self.tasks:
-            print(format_str.format(task.task_id, task.description, task.priority, task.due_date, 
-                                    id_width=max_widths["ID"] + 2,  
-                                    desc_width=max_widths["Description"] + 2,  
-                                    priority_width=max_widths["Priority"] + 2,  
-                                    due_date_width=max_widths["Due Date"] + 2))
+    def display_tasks(self):
+        self._render(self.tasks, "Tasks:")
 
     def sort_tasks(self, sort_option):
         if sort_option == 'priority':
-            self.sorted_tasks = sorted(self.tasks, key=lambda x: x.priority, reverse=True)
+            self.sorted_tasks = self._by_priority[::-1]  # Highest priority first
         elif sort_option == 'due_date':
-            self.sorted_tasks = sorted(self.tasks, key=lambda x: datetime.datetime.strptime(x.due_date, '%Y-%m-%d'))
+            self.sorted_tasks = self._by_due_date[:]
 
     def display_sorted_tasks(self):
-        if not self.sorted_tasks:
-            print("No tasks to display.")
-            return
-
-        # Determine the maximum width for each column
-        max_widths = {
-            "ID": 5,
-            "Description": 20,
-            "Priority": 10,
-            "Due Date": 12
-        }
-
-        for task in self.sorted_tasks:
-            # Update max_widths based on task details
-            max_widths["ID"] = max(max_widths["ID"], len(str(task.task_id)))
-            max_widths["Description"] = max(max_widths["Description"], len(task.description))
-            max_widths["Priority"] = max(max_widths["Priority"], len(str(task.priority)))
-            max_widths["Due Date"] = max(max_widths["Due Date"], len(task.due_date))
-
-        # Display the sorted tasks with adjusted column widths
-        print("Sorted Tasks:")
-        format_str = "{:<{id_width}} | {:<{desc_width}} | {:<{priority_width}} | {:<{due_date_width}}"
-        print(format_str.format("ID", "Description", "Priority", "Due Date", 
-                                id_width=max_widths["ID"] + 2,  # Adding 2 for padding
-                                desc_width=max_widths["Description"] + 2,  # Adding 2 for padding
-                                priority_width=max_widths["Priority"] + 2,  # Adding 2 for padding
-                                due_date_width=max_widths["Due Date"] + 2))  # Adding 2 for padding
-        print("-" * sum(max_widths.values()))
-
-        for task in self.sorted_tasks:
-            print(format_str.format(task.task_id, task.description, task.priority, task.due_date, 
-                                    id_width=max_widths["ID"] + 2,  
-                                    desc_width=max_widths["Description"] + 2,  
-                                    priority_width=max_widths["Priority"] + 2,  
-                                    due_date_width=max_widths["Due Date"] + 2))
+        self._render(self.sorted_tasks, "Sorted Tasks:")
 
     def save_tasks(self, filename, callback=None):
-        with open(filename, 'w') as f:
-            for task in self.tasks:
-                f.write(f"{task.task_id},{task.description},{task.priority},{task.due_date}\n")
+        # Rows are written as CSV so descriptions containing commas or quotes survive a save/load round trip.
+        # The CSV is built in memory first so the file gets a single write.
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator='\n').writerows(
+            (task.task_id, task.description, task.priority, task.due_date) for task in self.tasks)
+        with open(filename, 'w', newline='', buffering=1 << 20) as f:
+            f.write(buf.getvalue())
         if callback:
             callback()  # Call the callback function if provided
 
@@ -156,36 +198,54 @@ class TaskManager:
         if not os.path.exists(filename):
             print("Tasks file not found. Creating a new one.")
             return
-        with open(filename, 'r') as f:
-            for line in f:
-                data = line.strip().split(',')
-                if len(data) != 4:
-                    print("Error: Invalid data format in tasks file.")
-                    continue
-                task_id, description, priority, due_date = data
-                self.add_task(description, priority, due_date)
+        # Map the file and copy it out in one sequential read instead of buffering it line by line
+        with open(filename, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return  # mmap cannot map an empty file
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                data = mm[:]
+        # Decode with the same default encoding open() uses for the text-mode save
+        for line in io.TextIOWrapper(io.BytesIO(data)):
+            line = line.rstrip('\n')
+            # Lines without quotes read the same as CSV and as the older comma-joined format. A quoted line is
+            # read as CSV only if it is exactly what save_tasks would write for that row; otherwise it comes from
+            # the older format, where quotes in a description were literal text, and is split on commas.
+            row = line.split(',')
+            if '"' in line:
+                quoted = next(csv.reader([line]), [])
+                if _csv_line(quoted) == line:
+                    row = quoted
+            # Loaded priorities must be in the same 1-5 range as typed input
+            try:
+                task_id, description, priority, due_date = row
+                task_id, priority = int(task_id), validate_priority(priority)
+                due_date = _normalize_due_date(due_date)
+            except ValueError:
+                print("Error: Invalid data format in tasks file.")
+                continue
+            self._add_task_loaded(task_id, description, priority, due_date)
 
 
 # TaskManagerWithThreads Class
 # This class extends TaskManager and introduces asynchronous task saving and loading using threading.
+# File I/O runs on a single reused worker thread, so loads and saves run in the order they were requested.
+# The pool is shut down at exit after pending saves finish, so a save is never cut off mid-write.
 # __init__: Initializes the class.
-# save_tasks_async: Asynchronously saves tasks to a file.
-# load_tasks_async: Asynchronously loads tasks from a file.
+# save_tasks_async: Asynchronously saves tasks to a file and returns a Future for the save.
+# load_tasks_async: Asynchronously loads tasks from a file and returns a Future for the load.
+
+_io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='tm-io')
+atexit.register(_io_pool.shutdown, wait=True)
 
 class TaskManagerWithThreads(TaskManager):
     def __init__(self):
         super().__init__()
 
     def save_tasks_async(self, filename):
-        def callback():
-            print("Tasks saved to file.")
-            time.sleep(1)  # Delay for 1 second
-        save_thread = threading.Thread(target=self.save_tasks, args=(filename, callback))
-        save_thread.start()
+        return _io_pool.submit(self.save_tasks, filename)
 
     def load_tasks_async(self, filename):
-        load_thread = threading.Thread(target=self.load_tasks, args=(filename,))
-        load_thread.start()
+        return _io_pool.submit(self.load_tasks, filename)
 
 
 # Utility Functions
@@ -194,42 +254,67 @@ class TaskManagerWithThreads(TaskManager):
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
 
-def display_menu():
+# The menu never changes, so it is built once and written in a single call
+_MENU = ("Welcome to the Task Manager!\n"
+         "Choose an option:\n"
+         "1. Add Task\n"
+         "2. Delete Task\n"
+         "3. Display Tasks\n"
+         "4. Sort Tasks\n"
+         "5. Save Tasks to File\n"
+         "6. Exit\n")
+
+# Accepted answers to the menu and sort prompts, checked by set membership
+_CHOICES = frozenset({'1', '2', '3', '4', '5', '6'})
+_SORT_OPTS = frozenset({'priority', 'due_date'})
+
+# An optional status message from the previous action is shown under the menu until the next repaint
+def display_menu(status=None):
     clear_screen()
-    print("Welcome to the Task Manager!")
-    print("Choose an option:")
-    print("1. Add Task")
-    print("2. Delete Task")
-    print("3. Display Tasks")
-    print("4. Sort Tasks")
-    print("5. Save Tasks to File")
-    print("6. Exit")
-
-def get_valid_input(prompt, validation_func):
+    sys.stdout.write(_MENU)
+    if status:
+        print(status)
+
+# get_valid_input returns the first input accepted by validation_func. With transform=True, validation_func
+# instead converts the input: its result is returned, and a ValueError it raises marks the input as invalid.
+
+def get_valid_input(prompt, validation_func, transform=False):
     while True:
         user_input = input(prompt)
-        if validation_func(user_input):
+        if transform:
+            try:
+                return validation_func(user_input)
+            except ValueError:
+                pass
+        elif validation_func(user_input):
             return user_input
-        else:
-            print("Invalid input. Please try again.")
+        print("Invalid input. Please try again.")
+
+# validate_priority returns the priority as an int, raising ValueError if it is not a whole number from 1 to 5.
 
 def validate_priority(priority):
-    try:
-        priority = int(priority)
-        if priority < 1 or priority > 5:
-            raise ValueError
-        return priority
-    except ValueError:
-        return None
+    priority = int(priority)
+    if priority < 1 or priority > 5:
+        raise ValueError(f"priority out of range: {priority}")
+    return priority
+
+# Matches word characters that are neither decimal digits nor underscores. Nearly every match is a letter,
+# but numeric characters such as '½' also match, so each match is confirmed with str.isalpha.
+_ALPHA_RE = re.compile(r'[^\W\d_]')
 
 def validate_task_description(description):
-    return any(char.isalpha() for char in description)
+    return any(match.group().isalpha() for match in _ALPHA_RE.finditer(description))
+
+# validate_due_date accepts an optional today argument so callers validating many dates in a batch
+# can look up the current date once and reuse it.
 
-def validate_due_date(date_string):
+def validate_due_date(date_string, today=None):
     try:
-        due_date = datetime.datetime.strptime(date_string, '%Y-%m-%d')
-        current_date = datetime.datetime.now().date()
-        if due_date.date() >= current_date:
+        due_date = _parse_due_date(date_string)
+        if due_date.isoformat() != date_string:
+            return False
+        current_date = today if today is not None else datetime.date.today()
+        if due_date >= current_date:
             return True
         else:
             return False
@@ -240,15 +325,25 @@ def validate_due_date(date_string):
 # Main Function
 # The main function is where the program execution starts. 
 # It initializes a TaskManagerWithThreads, loads tasks asynchronously, and enters a loop to display the menu and handle user choices.
+# The load must finish before the menu starts: if it fails, the program stops rather than let a later save
+# overwrite the file with an empty task list. Saving waits for the save to finish so that its outcome is
+# shown with the very next menu.
 
 def main():
     task_manager = TaskManagerWithThreads()  # Use TaskManagerWithThreads
     filename = "tasks.txt"
-    task_manager.load_tasks_async(filename)  # Load tasks asynchronously
+    load_future = task_manager.load_tasks_async(filename)  # Load tasks asynchronously
+    try:
+        load_future.result()
+    except (OSError, ValueError, csv.Error) as e:
+        print(f"Error: could not load tasks from {filename}: {e}")
+        return
+    status = None  # Result of the last action, shown with the next menu
 
     while True:
-        display_menu()
-        choice = get_valid_input("Enter your choice: ", lambda x: x.isdigit() and 1 <= int(x) <= 6)
+        display_menu(status)
+        status = None
+        choice = get_valid_input("Enter your choice: ", lambda x: x in _CHOICES)
 
         if choice == '1':
             while True:
@@ -257,7 +352,7 @@ def main():
                     break
                 else:
                     print("Task description must contain at least one non-integer character.")
-            priority = get_valid_input("Enter task priority (1-5): ", lambda x: validate_priority(x))
+            priority = get_valid_input("Enter task priority (1-5): ", validate_priority, transform=True)
             while True:
                 due_date = input("Enter due date (YYYY-MM-DD): ")
                 if validate_due_date(due_date):
@@ -265,25 +360,28 @@ def main():
                 else:
                     print("Invalid date format or past date. Please enter a valid future date in YYYY-MM-DD format.")
             task_manager.add_task(description, priority, due_date)
-            print("Task added successfully!")
-            time.sleep(1)
+            status = "Task added successfully!"
         elif choice == '2':
             task_id = input("Enter task ID to delete: ")
             if not task_manager.delete_task(int(task_id)):
-                print("Task not found.")
+                status = "Task not found."
             else:
-                print("Task deleted successfully!")
-            time.sleep(1)
+                status = "Task deleted successfully!"
         elif choice == '3':
             task_manager.display_tasks()
             input("Press Enter to continue...")
         elif choice == '4':
-            sort_option = get_valid_input("Sort tasks by (priority/due_date): ", lambda x: x in ['priority', 'due_date'])
+            sort_option = get_valid_input("Sort tasks by (priority/due_date): ", lambda x: x in _SORT_OPTS)
             task_manager.sort_tasks(sort_option)
             task_manager.display_sorted_tasks()
             input("Press Enter to continue...")
         elif choice == '5':
-            task_manager.save_tasks_async(filename)  # Save tasks asynchronously
+            save_future = task_manager.save_tasks_async(filename)  # Save tasks asynchronously
+            error = save_future.exception()  # Wait for the save so its result belongs to this action
+            if error is not None:
+                status = f"Error: could not save tasks: {error}"
+            else:
+                status = "Tasks saved to file."
         elif choice == '6':
             break
 